@@ -1,6 +1,21 @@
 from enum import Enum
-from inspect import signature
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+from functools import lru_cache
+from inspect import Signature, signature
+from itertools import chain
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from weakref import WeakKeyDictionary
 
 from opentelemetry import context as context_api
 from opentelemetry import trace as trace_api
@@ -21,39 +36,84 @@ if TYPE_CHECKING:
     from smolagents.tools import Tool  # type: ignore[import-untyped]
 
 
-def _flatten(mapping: Optional[Mapping[str, Any]]) -> Iterator[Tuple[str, AttributeValue]]:
+def _flatten_into(
+    flattened: Dict[str, AttributeValue], mapping: Optional[Mapping[str, Any]]
+) -> None:
     if not mapping:
         return
-    for key, value in mapping.items():
-        if value is None:
-            continue
-        if isinstance(value, Mapping):
-            for sub_key, sub_value in _flatten(value):
-                yield f"{key}.{sub_key}", sub_value
-        elif isinstance(value, list) and any(isinstance(item, Mapping) for item in value):
-            for index, sub_mapping in enumerate(value):
-                for sub_key, sub_value in _flatten(sub_mapping):
-                    yield f"{key}.{index}.{sub_key}", sub_value
+    # Each stack entry pairs a key prefix with a partially consumed items iterator, so
+    # nested mappings are walked depth-first in their original order without recursion.
+    stack: List[Tuple[str, Iterator[Tuple[str, Any]]]] = [("", iter(mapping.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if value is None:
+                continue
+            if isinstance(value, Mapping):
+                if value:
+                    stack.append((f"{prefix}{key}.", iter(value.items())))
+                    break
+            elif isinstance(value, list) and any(isinstance(item, Mapping) for item in value):
+                nested = [
+                    (f"{prefix}{key}.{index}.", iter(sub_mapping.items()))
+                    for index, sub_mapping in enumerate(value)
+                    if sub_mapping
+                ]
+                if nested:
+                    stack.extend(reversed(nested))
+                    break
+            else:
+                if isinstance(value, Enum):
+                    value = value.value
+                flattened[f"{prefix}{key}"] = value
         else:
-            if isinstance(value, Enum):
-                value = value.value
-            yield key, value
+            stack.pop()
+
+
+def _span_start_attributes(
+    span_kind_attributes: Mapping[str, AttributeValue],
+    attributes: Iterable[Tuple[str, AttributeValue]] = (),
+) -> Mapping[str, AttributeValue]:
+    # When there is nothing to add, the shared read-only span kind mapping is passed
+    # to the tracer without being copied.
+    start_attributes: Optional[Dict[str, AttributeValue]] = None
+    for key, value in chain(attributes, get_attributes_from_context()):
+        if start_attributes is None:
+            start_attributes = dict(span_kind_attributes)
+        start_attributes[key] = value
+    return span_kind_attributes if start_attributes is None else start_attributes
 
 
 def _get_input_value(method: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
     arguments = _bind_arguments(method, *args, **kwargs)
-    arguments = _strip_method_args(arguments)
-    return safe_json_dumps(arguments)
+    return safe_json_dumps(_strip_method_args(arguments))
+
+
+_SIGNATURES: Dict[Tuple[Callable[..., Any], bool], Signature] = {}
+
+
+def _signature(method: Callable[..., Any]) -> Signature:
+    # Wrapped methods arrive as freshly bound method objects on every call, so
+    # signatures are cached on the underlying function rather than on the method.
+    function = getattr(method, "__func__", method)
+    key = (function, function is not method)
+    if (method_signature := _SIGNATURES.get(key)) is None:
+        method_signature = _SIGNATURES[key] = signature(method)
+    return method_signature
 
 
 def _bind_arguments(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Dict[str, Any]:
-    method_signature = signature(method)
+    method_signature = _signature(method)
     bound_args = method_signature.bind(*args, **kwargs)
     bound_args.apply_defaults()
     return bound_args.arguments
 
 
-def _strip_method_args(arguments: Mapping[str, Any]) -> dict[str, Any]:
+def _strip_method_args(arguments: Mapping[str, Any]) -> Mapping[str, Any]:
+    # Wrapped methods are bound, so their arguments rarely include the receiver
+    # and can usually be serialized without being copied.
+    if "self" not in arguments and "cls" not in arguments:
+        return arguments
     return {key: value for key, value in arguments.items() if key not in ("self", "cls")}
 
 
@@ -67,30 +127,20 @@ def _smolagent_run_attributes(
     yield "smolagents.max_steps", agent.max_steps
     yield "smolagents.tools_names", list(agent.tools.keys())
     for managed_agent_index, managed_agent in enumerate(agent.managed_agents.values()):
-        yield f"smolagents.managed_agents.{managed_agent_index}.name", managed_agent.name
-        yield (
-            f"smolagents.managed_agents.{managed_agent_index}.description",
-            managed_agent.description,
-        )
-        if getattr(managed_agent, "additional_prompting", None):
-            yield (
-                f"smolagents.managed_agents.{managed_agent_index}.additional_prompting",
-                managed_agent.additional_prompting,
-            )
-        elif getattr(managed_agent, "managed_agent_prompt", None):
-            yield (
-                f"smolagents.managed_agents.{managed_agent_index}.managed_agent_prompt",
-                managed_agent.managed_agent_prompt,
-            )
-        if getattr(managed_agent, "agent", None):
-            yield (
-                f"smolagents.managed_agents.{managed_agent_index}.max_steps",
-                managed_agent.agent.max_steps,
-            )
-            yield (
-                f"smolagents.managed_agents.{managed_agent_index}.tools_names",
-                list(managed_agent.agent.tools.keys()),
-            )
+        prefix = f"smolagents.managed_agents.{managed_agent_index}"
+        yield f"{prefix}.name", managed_agent.name
+        yield f"{prefix}.description", managed_agent.description
+        if additional_prompting := getattr(managed_agent, "additional_prompting", None):
+            yield f"{prefix}.additional_prompting", additional_prompting
+        elif managed_agent_prompt := getattr(managed_agent, "managed_agent_prompt", None):
+            yield f"{prefix}.managed_agent_prompt", managed_agent_prompt
+        # Older smolagents releases wrap managed agents in a ManagedAgent that exposes the
+        # underlying agent as `.agent`; newer releases pass the agent itself.
+        inner_agent = getattr(managed_agent, "agent", None) or managed_agent
+        if (max_steps := getattr(inner_agent, "max_steps", None)) is not None:
+            yield f"{prefix}.max_steps", max_steps
+        if isinstance(tools := getattr(inner_agent, "tools", None), Mapping):
+            yield f"{prefix}.tools_names", list(tools.keys())
 
 
 class _RunWrapper:
@@ -109,32 +159,27 @@ class _RunWrapper:
         span_name = f"{instance.__class__.__name__}.run"
         agent = instance
         arguments = _bind_arguments(wrapped, *args, **kwargs)
+        run_attributes: Dict[str, AttributeValue] = {}
+        _flatten_into(run_attributes, dict(_smolagent_run_attributes(agent, arguments)))
         with self._tracer.start_as_current_span(
             span_name,
-            attributes=dict(
-                _flatten(
-                    {
-                        OPENINFERENCE_SPAN_KIND: AGENT,
-                        INPUT_VALUE: _get_input_value(
-                            wrapped,
-                            *args,
-                            **kwargs,
-                        ),
-                        **dict(_smolagent_run_attributes(agent, arguments)),
-                        **dict(get_attributes_from_context()),
-                    }
-                )
-            ),
+            attributes=_span_start_attributes(AGENT_SPAN_KIND_ATTRIBUTES, run_attributes.items()),
         ) as span:
+            if not span.is_recording():
+                return wrapped(*args, **kwargs)
+            span.set_attribute(INPUT_VALUE, safe_json_dumps(_strip_method_args(arguments)))
             agent_output = wrapped(*args, **kwargs)
-            span.set_attribute(LLM_TOKEN_COUNT_PROMPT, agent.monitor.total_input_token_count)
-            span.set_attribute(LLM_TOKEN_COUNT_COMPLETION, agent.monitor.total_output_token_count)
-            span.set_attribute(
-                LLM_TOKEN_COUNT_TOTAL,
-                agent.monitor.total_input_token_count + agent.monitor.total_output_token_count,
-            )
+            input_token_count = agent.monitor.total_input_token_count
+            output_token_count = agent.monitor.total_output_token_count
             span.set_status(trace_api.StatusCode.OK)
-            span.set_attribute(OUTPUT_VALUE, str(agent_output))
+            span.set_attributes(
+                {
+                    LLM_TOKEN_COUNT_PROMPT: input_token_count,
+                    LLM_TOKEN_COUNT_COMPLETION: output_token_count,
+                    LLM_TOKEN_COUNT_TOTAL: input_token_count + output_token_count,
+                    OUTPUT_VALUE: str(agent_output),
+                }
+            )
         return agent_output
 
 
@@ -155,12 +200,11 @@ class _StepWrapper:
         span_name = f"Step {agent.step_number}"
         with self._tracer.start_as_current_span(
             span_name,
-            attributes={
-                OPENINFERENCE_SPAN_KIND: CHAIN,
-                INPUT_VALUE: _get_input_value(wrapped, *args, **kwargs),
-                **dict(get_attributes_from_context()),
-            },
+            attributes=_span_start_attributes(CHAIN_SPAN_KIND_ATTRIBUTES),
         ) as span:
+            if not span.is_recording():
+                return wrapped(*args, **kwargs)
+            span.set_attribute(INPUT_VALUE, _get_input_value(wrapped, *args, **kwargs))
             result = wrapped(*args, **kwargs)
             step_log = args[0]  # ActionStep
             span.set_attribute(OUTPUT_VALUE, step_log.observations)
@@ -185,10 +229,19 @@ class _StepWrapper:
         return result
 
 
+@lru_cache(maxsize=256)
+def _llm_input_message_keys(index: int) -> Tuple[str, str]:
+    return (
+        f"{LLM_INPUT_MESSAGES}.{index}.{MESSAGE_ROLE}",
+        f"{LLM_INPUT_MESSAGES}.{index}.{MESSAGE_CONTENT}",
+    )
+
+
 def _llm_input_messages(arguments: Mapping[str, Any]) -> Iterator[Tuple[str, Any]]:
     def process_message(idx: int, role: str, content: str) -> Iterator[Tuple[str, Any]]:
-        yield f"{LLM_INPUT_MESSAGES}.{idx}.{MESSAGE_ROLE}", role
-        yield f"{LLM_INPUT_MESSAGES}.{idx}.{MESSAGE_CONTENT}", content
+        role_key, content_key = _llm_input_message_keys(idx)
+        yield role_key, role
+        yield content_key, content
 
     if isinstance(prompt := arguments.get("prompt"), str):
         yield from process_message(0, "user", prompt)
@@ -255,18 +308,42 @@ def _llm_invocation_parameters(
     yield LLM_INVOCATION_PARAMETERS, safe_json_dumps(model_kwargs | kwargs)
 
 
-def _llm_tools(tools_to_call_from: list[Any]) -> Iterator[Tuple[str, Any]]:
-    from smolagents import Tool
-    from smolagents.models import get_tool_json_schema  # type: ignore[import-untyped]
+@lru_cache(maxsize=256)
+def _llm_tool_json_schema_key(index: int) -> str:
+    return f"{LLM_TOOLS}.{index}.{TOOL_JSON_SCHEMA}"
+
+
+# Serialized tool schemas are computed once per tool instance and dropped when the
+# tool is garbage collected. Tools are treated as static: if a tool's name,
+# description or inputs are changed after its first model call, spans keep reporting
+# the schema as it was first seen.
+_TOOL_JSON_SCHEMAS: "WeakKeyDictionary[Tool, str]" = WeakKeyDictionary()
 
+
+def _llm_tools(
+    tools_to_call_from: list[Any],
+    tool_cls: type,
+    get_tool_json_schema: Callable[["Tool"], Dict[str, Any]],
+) -> Iterator[Tuple[str, Any]]:
     if not isinstance(tools_to_call_from, list):
         return
     for tool_index, tool in enumerate(tools_to_call_from):
-        if isinstance(tool, Tool):
-            yield (
-                f"{LLM_TOOLS}.{tool_index}.{TOOL_JSON_SCHEMA}",
-                safe_json_dumps(get_tool_json_schema(tool)),
-            )
+        if isinstance(tool, tool_cls):
+            try:
+                tool_json_schema = _TOOL_JSON_SCHEMAS.get(tool)
+            except TypeError:
+                # Tools that are unhashable (e.g. dataclasses) or cannot be weakly
+                # referenced are not cached and are serialized on every call.
+                yield (
+                    _llm_tool_json_schema_key(tool_index),
+                    safe_json_dumps(get_tool_json_schema(tool)),
+                )
+                continue
+            if tool_json_schema is None:
+                tool_json_schema = _TOOL_JSON_SCHEMAS[tool] = safe_json_dumps(
+                    get_tool_json_schema(tool)
+                )
+            yield _llm_tool_json_schema_key(tool_index), tool_json_schema
 
 
 def _tools(tool: "Tool") -> Iterator[Tuple[str, Any]]:
@@ -284,7 +361,14 @@ def _input_value_and_mime_type(arguments: Mapping[str, Any]) -> Iterator[Tuple[s
 
 class _ModelWrapper:
     def __init__(self, tracer: trace_api.Tracer) -> None:
+        # Constructed only from `_instrument`, after smolagents has been imported, so
+        # importing this module does not pull in smolagents.
+        from smolagents import Tool
+        from smolagents.models import get_tool_json_schema  # type: ignore[import-untyped]
+
         self._tracer = tracer
+        self._tool_cls = Tool
+        self._get_tool_json_schema = get_tool_json_schema
 
     def __call__(
         self,
@@ -295,30 +379,41 @@ class _ModelWrapper:
     ) -> Any:
         if context_api.get_value(context_api._SUPPRESS_INSTRUMENTATION_KEY):
             return wrapped(*args, **kwargs)
-        arguments = _bind_arguments(wrapped, *args, **kwargs)
         span_name = f"{instance.__class__.__name__}.generate"
         model = instance
+        arguments = _bind_arguments(wrapped, *args, **kwargs)
         with self._tracer.start_as_current_span(
             span_name,
-            attributes={
-                OPENINFERENCE_SPAN_KIND: LLM,
-                **dict(_input_value_and_mime_type(arguments)),
-                **dict(_llm_invocation_parameters(instance, arguments)),
-                **dict(_llm_input_messages(arguments)),
-                **dict(get_attributes_from_context()),
-            },
+            attributes=_span_start_attributes(
+                LLM_SPAN_KIND_ATTRIBUTES,
+                _llm_invocation_parameters(instance, arguments),
+            ),
         ) as span:
+            if not span.is_recording():
+                return wrapped(*args, **kwargs)
+            attributes = dict(_input_value_and_mime_type(arguments))
+            attributes.update(_llm_input_messages(arguments))
+            span.set_attributes(attributes)
             output_message = wrapped(*args, **kwargs)
+            input_token_count = model.last_input_token_count
+            output_token_count = model.last_output_token_count
             span.set_status(trace_api.StatusCode.OK)
-            span.set_attribute(LLM_TOKEN_COUNT_PROMPT, model.last_input_token_count)
-            span.set_attribute(LLM_TOKEN_COUNT_COMPLETION, model.last_output_token_count)
-            span.set_attribute(LLM_MODEL_NAME, model.model_id)
-            span.set_attribute(
-                LLM_TOKEN_COUNT_TOTAL, model.last_input_token_count + model.last_output_token_count
+            attributes = {
+                LLM_TOKEN_COUNT_PROMPT: input_token_count,
+                LLM_TOKEN_COUNT_COMPLETION: output_token_count,
+                LLM_MODEL_NAME: model.model_id,
+                LLM_TOKEN_COUNT_TOTAL: input_token_count + output_token_count,
+            }
+            attributes.update(_llm_output_messages(output_message))
+            attributes.update(
+                _llm_tools(
+                    arguments.get("tools_to_call_from", []),
+                    self._tool_cls,
+                    self._get_tool_json_schema,
+                )
             )
-            span.set_attributes(_llm_output_messages(output_message))
-            span.set_attributes(dict(_llm_tools(arguments.get("tools_to_call_from", []))))
-            span.set_attributes(dict(_output_value_and_mime_type(output_message)))
+            attributes.update(_output_value_and_mime_type(output_message))
+            span.set_attributes(attributes)
         return output_message
 
 
@@ -338,17 +433,11 @@ class _ToolCallWrapper:
         span_name = f"{instance.__class__.__name__}"
         with self._tracer.start_as_current_span(
             span_name,
-            attributes={
-                OPENINFERENCE_SPAN_KIND: TOOL,
-                INPUT_VALUE: _get_input_value(
-                    wrapped,
-                    *args,
-                    **kwargs,
-                ),
-                **dict(_tools(instance)),
-                **dict(get_attributes_from_context()),
-            },
+            attributes=_span_start_attributes(TOOL_SPAN_KIND_ATTRIBUTES, _tools(instance)),
         ) as span:
+            if not span.is_recording():
+                return wrapped(*args, **kwargs)
+            span.set_attribute(INPUT_VALUE, _get_input_value(wrapped, *args, **kwargs))
             response = wrapped(*args, **kwargs)
             span.set_status(trace_api.StatusCode.OK)
             span.set_attributes(
@@ -417,6 +506,12 @@ CHAIN = OpenInferenceSpanKindValues.CHAIN.value
 LLM = OpenInferenceSpanKindValues.LLM.value
 TOOL = OpenInferenceSpanKindValues.TOOL.value
 
+# span kind attributes
+AGENT_SPAN_KIND_ATTRIBUTES = MappingProxyType({OPENINFERENCE_SPAN_KIND: AGENT})
+CHAIN_SPAN_KIND_ATTRIBUTES = MappingProxyType({OPENINFERENCE_SPAN_KIND: CHAIN})
+LLM_SPAN_KIND_ATTRIBUTES = MappingProxyType({OPENINFERENCE_SPAN_KIND: LLM})
+TOOL_SPAN_KIND_ATTRIBUTES = MappingProxyType({OPENINFERENCE_SPAN_KIND: TOOL})
+
 # tool attributes
 TOOL_JSON_SCHEMA = ToolAttributes.TOOL_JSON_SCHEMA
 
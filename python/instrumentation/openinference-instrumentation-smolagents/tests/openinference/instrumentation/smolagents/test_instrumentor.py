@@ -1,5 +1,6 @@
 import json
 import os
+from dataclasses import dataclass
 from typing import Any, Generator, Optional
 
 import pytest
@@ -18,10 +19,12 @@ from smolagents.models import (  # type: ignore[import-untyped]
     ChatMessage,
     ChatMessageToolCall,
     ChatMessageToolCallDefinition,
+    Model,
+    get_tool_json_schema,
 )
 
-from openinference.instrumentation import OITracer
-from openinference.instrumentation.smolagents import SmolagentsInstrumentor
+from openinference.instrumentation import OITracer, TraceConfig
+from openinference.instrumentation.smolagents import SmolagentsInstrumentor, _wrappers
 from openinference.semconv.trace import (
     MessageAttributes,
     MessageContentAttributes,
@@ -104,6 +107,33 @@ def anthropic_api_key(monkeypatch: pytest.MonkeyPatch) -> str:
     return api_key
 
 
+class FinalAnswerModel(Model):  # type: ignore[misc]
+    def generate(
+        self,
+        messages: list[dict[str, Any]],
+        stop_sequences: Optional[list[str]] = None,
+        response_format: Optional[dict[str, str]] = None,
+        tools_to_call_from: Optional[list[Tool]] = None,
+        **kwargs: Any,
+    ) -> ChatMessage:
+        self.last_input_token_count = 10
+        self.last_output_token_count = 5
+        return ChatMessage(
+            role="assistant",
+            content="",
+            tool_calls=[
+                ChatMessageToolCall(
+                    id="call_0",
+                    type="function",
+                    function=ChatMessageToolCallDefinition(
+                        name="final_answer",
+                        arguments={"answer": "Final report."},
+                    ),
+                )
+            ],
+        )
+
+
 class TestInstrumentor:
     def test_entrypoint_for_opentelemetry_instrument(self) -> None:
         (instrumentor_entrypoint,) = entry_points(
@@ -360,6 +390,112 @@ class TestModels:
         assert not attributes
 
 
+class TestLlmTools:
+    def test_tool_json_schema_is_built_once_per_tool(self) -> None:
+        class GetWeatherTool(Tool):  # type: ignore[misc]
+            name = "get_weather"
+            description = "Get the weather for a given city"
+            inputs = {
+                "location": {"type": "string", "description": "The city to get the weather for"}
+            }
+            output_type = "string"
+
+            def forward(self, location: str) -> str:
+                return "sunny"
+
+        schema_calls = 0
+
+        def counting_get_tool_json_schema(tool: Tool) -> dict[str, Any]:
+            nonlocal schema_calls
+            schema_calls += 1
+            return dict(get_tool_json_schema(tool))
+
+        weather_tool = GetWeatherTool()
+        for _ in range(2):
+            attributes = dict(
+                _wrappers._llm_tools(
+                    [weather_tool, weather_tool], Tool, counting_get_tool_json_schema
+                )
+            )
+            assert set(attributes) == {
+                f"{LLM_TOOLS}.0.{TOOL_JSON_SCHEMA}",
+                f"{LLM_TOOLS}.1.{TOOL_JSON_SCHEMA}",
+            }
+            for tool_json_schema in attributes.values():
+                assert json.loads(tool_json_schema) == get_tool_json_schema(weather_tool)
+        assert schema_calls == 1
+
+    def test_unhashable_tool_json_schema_is_serialized_without_caching(self) -> None:
+        @dataclass
+        class GetWeatherTool(Tool):  # type: ignore[misc]
+            name: str = "get_weather"
+            description: str = "Get the weather for a given city"
+            inputs = {
+                "location": {"type": "string", "description": "The city to get the weather for"}
+            }
+            output_type: str = "string"
+
+            def forward(self, location: str) -> str:
+                return "sunny"
+
+        schema_calls = 0
+
+        def counting_get_tool_json_schema(tool: Tool) -> dict[str, Any]:
+            nonlocal schema_calls
+            schema_calls += 1
+            return dict(get_tool_json_schema(tool))
+
+        weather_tool = GetWeatherTool()
+        for _ in range(2):
+            attributes = dict(
+                _wrappers._llm_tools([weather_tool], Tool, counting_get_tool_json_schema)
+            )
+            tool_json_schema = attributes.pop(f"{LLM_TOOLS}.0.{TOOL_JSON_SCHEMA}")
+            assert json.loads(tool_json_schema) == get_tool_json_schema(weather_tool)
+            assert not attributes
+        assert schema_calls == 2
+
+    def test_model_span_records_unhashable_tool_json_schema(
+        self,
+        tracer_provider: trace_api.TracerProvider,
+        in_memory_span_exporter: InMemorySpanExporter,
+    ) -> None:
+        @dataclass
+        class GetWeatherTool(Tool):  # type: ignore[misc]
+            name: str = "get_weather"
+            description: str = "Get the weather for a given city"
+            inputs = {
+                "location": {"type": "string", "description": "The city to get the weather for"}
+            }
+            output_type: str = "string"
+
+            def forward(self, location: str) -> str:
+                return "sunny"
+
+        weather_tool = GetWeatherTool()
+        model = FinalAnswerModel(model_id="fake-model")
+        model_wrapper = _wrappers._ModelWrapper(
+            tracer=OITracer(tracer_provider.get_tracer(__name__), config=TraceConfig())
+        )
+        messages = [{"role": "user", "content": [{"type": "text", "text": "Fake question."}]}]
+
+        output_message = model_wrapper(
+            model.generate,
+            model,
+            (),
+            {"messages": messages, "tools_to_call_from": [weather_tool]},
+        )
+
+        assert output_message.tool_calls[0].function.arguments == {"answer": "Final report."}
+        spans = in_memory_span_exporter.get_finished_spans()
+        assert len(spans) == 1
+        attributes = dict(spans[0].attributes or {})
+        assert isinstance(
+            tool_json_schema := attributes.get(f"{LLM_TOOLS}.0.{TOOL_JSON_SCHEMA}"), str
+        )
+        assert json.loads(tool_json_schema) == get_tool_json_schema(weather_tool)
+
+
 class TestRun:
     @pytest.mark.xfail
     def test_multiagents(self) -> None:
@@ -484,6 +620,56 @@ final_answer("Final report.")
         report = manager_toolcalling_agent.run("Fake question.")
         assert report == "Final report."
 
+    def test_run_span_has_managed_agent_attributes(
+        self, in_memory_span_exporter: InMemorySpanExporter
+    ) -> None:
+        web_agent = ToolCallingAgent(
+            tools=[],
+            model=FinalAnswerModel(model_id="fake-model"),
+            max_steps=7,
+            name="search_agent",
+            description="Runs web searches for you.",
+        )
+        manager_agent = ToolCallingAgent(
+            tools=[],
+            model=FinalAnswerModel(model_id="fake-model"),
+            managed_agents=[web_agent],
+        )
+
+        assert manager_agent.run("Fake question.") == "Final report."
+
+        run_spans = [
+            span
+            for span in in_memory_span_exporter.get_finished_spans()
+            if span.name == "ToolCallingAgent.run"
+        ]
+        assert len(run_spans) == 1
+        attributes = dict(run_spans[0].attributes or {})
+        assert attributes.pop(OPENINFERENCE_SPAN_KIND) == AGENT
+        assert isinstance(input_value := attributes.pop(INPUT_VALUE), str)
+        assert json.loads(input_value) == {
+            "task": "Fake question.",
+            "stream": False,
+            "reset": True,
+            "images": None,
+            "additional_args": None,
+            "max_steps": None,
+        }
+        assert attributes.pop("smolagents.max_steps") == 20
+        assert attributes.pop("smolagents.tools_names") == ("final_answer",)
+        assert attributes.pop("smolagents.managed_agents.0.name") == "search_agent"
+        assert (
+            attributes.pop("smolagents.managed_agents.0.description")
+            == "Runs web searches for you."
+        )
+        assert attributes.pop("smolagents.managed_agents.0.max_steps") == 7
+        assert attributes.pop("smolagents.managed_agents.0.tools_names") == ("final_answer",)
+        assert attributes.pop(LLM_TOKEN_COUNT_PROMPT) == 10
+        assert attributes.pop(LLM_TOKEN_COUNT_COMPLETION) == 5
+        assert attributes.pop(LLM_TOKEN_COUNT_TOTAL) == 15
+        assert attributes.pop(OUTPUT_VALUE) == "Final report."
+        assert not attributes
+
 
 class TestTools:
     def test_tool_invocation_returning_string_has_expected_attributes(
@@ -578,6 +764,76 @@ class TestTools:
         assert not attributes
 
 
+class TestNonRecordingSpans:
+    @pytest.fixture(autouse=True)
+    def fail_on_attribute_serialization(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("attributes were serialized for a non-recording span")
+
+        for name in (
+            "_get_input_value",
+            "_strip_method_args",
+            "_input_value_and_mime_type",
+            "_llm_input_messages",
+            "_llm_output_messages",
+            "_output_value_and_mime_type",
+            "_output_value_and_mime_type_for_tool_span",
+        ):
+            monkeypatch.setattr(_wrappers, name, fail)
+
+    @pytest.fixture(autouse=True)
+    def unsampled_parent(self) -> Generator[None, None, None]:
+        span_context = trace_api.SpanContext(
+            trace_id=1,
+            span_id=1,
+            is_remote=False,
+            trace_flags=trace_api.TraceFlags(trace_api.TraceFlags.DEFAULT),
+        )
+        with trace_api.use_span(trace_api.NonRecordingSpan(span_context)):
+            yield
+
+    def test_run_skips_attribute_serialization(
+        self, in_memory_span_exporter: InMemorySpanExporter
+    ) -> None:
+        agent = ToolCallingAgent(tools=[], model=FinalAnswerModel(model_id="fake-model"))
+
+        assert agent.run("Fake question.") == "Final report."
+        assert not in_memory_span_exporter.get_finished_spans()
+
+    def test_model_skips_attribute_serialization(
+        self,
+        tracer_provider: trace_api.TracerProvider,
+        in_memory_span_exporter: InMemorySpanExporter,
+    ) -> None:
+        model = FinalAnswerModel(model_id="fake-model")
+        model_wrapper = _wrappers._ModelWrapper(
+            tracer=OITracer(tracer_provider.get_tracer(__name__), config=TraceConfig())
+        )
+        messages = [{"role": "user", "content": [{"type": "text", "text": "Fake question."}]}]
+
+        output_message = model_wrapper(model.generate, model, (), {"messages": messages})
+
+        assert output_message.tool_calls[0].function.arguments == {"answer": "Final report."}
+        assert not in_memory_span_exporter.get_finished_spans()
+
+    def test_tool_skips_attribute_serialization(
+        self, in_memory_span_exporter: InMemorySpanExporter
+    ) -> None:
+        class GetWeatherTool(Tool):  # type: ignore[misc]
+            name = "get_weather"
+            description = "Get the weather for a given city"
+            inputs = {
+                "location": {"type": "string", "description": "The city to get the weather for"}
+            }
+            output_type = "string"
+
+            def forward(self, location: str) -> str:
+                return "sunny"
+
+        assert GetWeatherTool()("Paris") == "sunny"
+        assert not in_memory_span_exporter.get_finished_spans()
+
+
 # message attributes
 MESSAGE_CONTENT = MessageAttributes.MESSAGE_CONTENT
 MESSAGE_CONTENTS = MessageAttributes.MESSAGE_CONTENTS
@@ -594,6 +850,7 @@ JSON = OpenInferenceMimeTypeValues.JSON.value
 TEXT = OpenInferenceMimeTypeValues.TEXT.value
 
 # span kinds
+AGENT = OpenInferenceSpanKindValues.AGENT.value
 CHAIN = OpenInferenceSpanKindValues.CHAIN.value
 LLM = OpenInferenceSpanKindValues.LLM.value
 TOOL = OpenInferenceSpanKindValues.TOOL.value